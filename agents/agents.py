@@ -1,8 +1,4 @@
 from langchain_core.prompts import ChatPromptTemplate
-from langchain_community.document_loaders import WebBaseLoader
-from langchain_openai import OpenAIEmbeddings
-from langchain.text_splitter import RecursiveCharacterTextSplitter
-from langchain_community.vectorstores import FAISS
 from typing import Dict, Any
 import sys
 import os
@@ -10,18 +6,13 @@ import os
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from llm_config import get_llm, get_rag_chain
+from ingest import ingest_urls
 
 # Rest of the agents.py code remains the same...
 
 def load_and_process_url(url: str):
     """Load and process website content"""
-    loader = WebBaseLoader(url)
-    docs = loader.load()
-
-    text_splitter = RecursiveCharacterTextSplitter(chunk_size=1000, chunk_overlap=200)
-    splits = text_splitter.split_documents(docs)
-
-    vectorstore = FAISS.from_documents(splits, OpenAIEmbeddings())
+    vectorstore = ingest_urls([url])
     return vectorstore.as_retriever()
 
 def _categorizer_agent(retriever) -> str:
@@ -6,6 +6,9 @@ import os
 
 # Add parent directory to path for imports
 from agents.agents import review_url  # Updated import path
+from llm_cache import get_response_cache
+from review_cache import PopularityTracker, ReviewStore
+from warmer import WARMER_MODE, CacheWarmer
 
 app = FastAPI(
     title="AI Tool Reviewer API",
@@ -13,6 +16,20 @@ app = FastAPI(
     version="1.0.0"
 )
 
+review_store = ReviewStore()
+popularity = PopularityTracker()
+# Every worker flushes its popularity counts; warming passes run only in
+# one process, and only when no separate warmer worker is used
+warmer = CacheWarmer(review_store, popularity, warm=WARMER_MODE == "inprocess")
+
+@app.on_event("startup")
+async def start_warmer():
+    warmer.start()
+
+@app.on_event("shutdown")
+async def stop_warmer():
+    warmer.stop()
+
 class ReviewRequest(BaseModel):
     url: HttpUrl
 
@@ -26,8 +43,15 @@ class ReviewResponse(BaseModel):
 @app.post("/review", response_model=ReviewResponse)
 async def review_ai_tool(request: ReviewRequest) -> Dict[str, Any]:
     """Generate a comprehensive review for an AI tool website"""
+    url = str(request.url)
+    popularity.record(url)
+    cached = review_store.get_fresh_review(url)
+    if cached is not None:
+        return cached
     try:
-        return review_url(str(request.url))
+        review = review_url(url)
+        review_store.put(url, review)
+        return review
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -37,4 +61,9 @@ async def review_ai_tool(request: ReviewRequest) -> Dict[str, Any]:
 @app.get("/health")
 async def health_check():
     """Simple health check endpoint"""
-    return {"status": "healthy"} 
\ No newline at end of file
+    return {"status": "healthy"}
+
+@app.get("/cache/stats")
+async def cache_stats():
+    """Hit-rate metrics for the shared LLM response cache"""
+    return get_response_cache().stats()
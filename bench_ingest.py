@@ -0,0 +1,130 @@
+"""
+Measure peak RSS and end-to-end time of URL ingestion on a generated local site.
+
+    python bench_ingest.py --pages 2000 --paragraphs 40
+
+Each mode runs in its own subprocess so peak RSS figures are independent.
+Embeddings are faked by default to isolate the pipeline; pass --openai to
+use OpenAIEmbeddings instead.
+"""
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+import argparse
+import json
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+WORDS = "agent model voice pricing api token workflow latency dataset prompt".split()
+
+
+def build_site(root: Path, pages: int, paragraphs: int):
+    """Write a static doc site with `pages` HTML pages"""
+    rng = random.Random(0)
+    for i in range(pages):
+        body = "\n".join(
+            f"<p>{' '.join(rng.choice(WORDS) for _ in range(120))}</p>"
+            for _ in range(paragraphs)
+        )
+        (root / f"page{i}.html").write_text(
+            f"<html><body><h1>Page {i}</h1>{body}</body></html>", encoding="utf-8"
+        )
+
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+
+def serve(root: Path):
+    handler = partial(QuietHandler, directory=str(root))
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def get_embeddings(use_openai: bool):
+    if use_openai:
+        from langchain_openai import OpenAIEmbeddings
+
+        return OpenAIEmbeddings()
+    from langchain_community.embeddings import FakeEmbeddings
+
+    return FakeEmbeddings(size=1536)
+
+
+def run_mode(mode: str, urls, use_openai: bool) -> dict:
+    embeddings = get_embeddings(use_openai)
+    stats = {}
+    start = time.perf_counter()
+    if mode == "streaming":
+        from ingest import ingest_urls
+
+        ingest_urls(urls, embeddings=embeddings, stats=stats)
+    else:
+        # The previous load_and_process_url: materialize, split, embed at once
+        from langchain_community.document_loaders import WebBaseLoader
+        from langchain_community.vectorstores import FAISS
+        from langchain.text_splitter import RecursiveCharacterTextSplitter
+
+        docs = WebBaseLoader(web_paths=urls).load()
+        splits = RecursiveCharacterTextSplitter(
+            chunk_size=1000, chunk_overlap=200
+        ).split_documents(docs)
+        FAISS.from_documents(splits, embeddings)
+        stats.update(pages=len(docs), chunks=len(splits))
+    stats["mode"] = mode
+    stats["seconds"] = round(time.perf_counter() - start, 2)
+    # ru_maxrss is reported in kilobytes on Linux
+    stats["peak_rss_mb"] = round(
+        resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1
+    )
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--pages", type=int, default=1000)
+    parser.add_argument("--paragraphs", type=int, default=40)
+    parser.add_argument("--openai", action="store_true")
+    parser.add_argument("--mode", choices=["streaming", "materialized"])
+    parser.add_argument("--urls", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        urls = json.loads(Path(args.urls).read_text())
+        print(json.dumps(run_mode(args.mode, urls, args.openai)))
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp) / "site"
+        root.mkdir()
+        build_site(root, args.pages, args.paragraphs)
+        server = serve(root)
+        host, port = server.server_address
+        urls_file = Path(tmp) / "urls.json"
+        urls_file.write_text(
+            json.dumps([f"http://{host}:{port}/page{i}.html" for i in range(args.pages)])
+        )
+
+        print(f"\n📊 Ingesting {args.pages} pages x {args.paragraphs} paragraphs\n")
+        for mode in ["materialized", "streaming"]:
+            command = [sys.executable, __file__, "--mode", mode, "--urls", str(urls_file)]
+            if args.openai:
+                command.append("--openai")
+            output = subprocess.run(command, capture_output=True, text=True, check=True)
+            result = json.loads(output.stdout.strip().splitlines()[-1])
+            print(
+                f"{mode:>12}: {result['seconds']:>8}s  peak RSS {result['peak_rss_mb']:>8} MB  "
+                f"({result['chunks']} chunks)"
+            )
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+Token-bounded conversation context for the Ollama chat app.
+
+Kept free of Streamlit so the window arithmetic can be tested on its own.
+"""
+MAX_CONTEXT_TOKENS = 3000  # budget for summary plus history sent with each prompt
+SUMMARY_TARGET_TOKENS = 1500  # summary plus history size to fold down to once over budget
+SUMMARY_MAX_TOKENS = 500  # hard cap on the rolling summary
+
+
+def estimate_tokens(text):
+    """Cheap token estimate (~4 characters per token)"""
+    return len(text) // 4 + 1
+
+
+def cap_summary(summary):
+    """Truncate a summary that ignored its length instruction"""
+    return summary[: SUMMARY_MAX_TOKENS * 4]
+
+
+def plan_context(
+    history,
+    start,
+    summary,
+    max_tokens=MAX_CONTEXT_TOKENS,
+    target_tokens=SUMMARY_TARGET_TOKENS,
+):
+    """
+    Decide where the verbatim window begins.
+
+    Args:
+        history: All messages, latest prompt last
+        start: Index of the first message not yet folded into the summary
+        summary: Current rolling summary ("" if none)
+
+    Returns:
+        Index of the first message to keep verbatim. Messages from `start`
+        up to it must be folded into the summary; equal to `start` when
+        summary plus window already fit in max_tokens.
+    """
+    window = history[start:]
+    summary_tokens = estimate_tokens(summary) if summary else 0
+    total = summary_tokens + sum(estimate_tokens(msg.content) for msg in window)
+    if total <= max_tokens or len(window) < 2:
+        return start
+
+    # Fold down to the target in one go so summarization runs occasionally
+    # instead of on every message. The latest prompt always stays verbatim.
+    cut = len(window) - 1
+    kept = summary_tokens + estimate_tokens(window[-1].content)
+    while cut > 1 and kept + estimate_tokens(window[cut - 1].content) <= target_tokens:
+        cut -= 1
+        kept += estimate_tokens(window[cut].content)
+    return start + cut
@@ -0,0 +1,269 @@
+from langchain_community.document_loaders import WebBaseLoader
+from langchain_community.vectorstores import FAISS
+from langchain_openai import OpenAIEmbeddings
+from langchain.text_splitter import RecursiveCharacterTextSplitter
+from dotenv import load_dotenv
+from typing import Iterable, Iterator, Optional
+import os
+import queue
+import re
+import threading
+
+# Load environment variables
+load_dotenv()
+
+# Pipeline settings (override in .env)
+EMBED_BATCH_SIZE = int(os.getenv("INGEST_EMBED_BATCH_SIZE", "64"))
+QUEUE_SIZE = int(os.getenv("INGEST_QUEUE_SIZE", "16"))
+# Upper bound on pages, chunks and embedding vectors held between stages, in MB
+MEMORY_CEILING_MB = float(os.getenv("INGEST_MEMORY_CEILING_MB", "64"))
+# Python list of floats: 8-byte slot plus a 24-byte float object per dimension
+VECTOR_BYTES_PER_DIM = 32
+
+_DONE = object()
+
+
+class MemoryBudget:
+    """
+    Approximate bytes in flight between stages (text counted at one byte
+    per character, vectors at VECTOR_BYTES_PER_DIM per dimension).
+
+    Only admission points block: fetch before taking a new page, and embed
+    before producing more vectors while earlier ones are still unindexed.
+    Everything downstream of a blocked stage releases without waiting, so
+    the pipeline always drains and the waiter eventually gets through.
+    Fetch may only fill half the ceiling, leaving the rest for vectors.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.in_flight = 0
+        self.vector_bytes = 0
+        self.peak = 0
+        self._cond = threading.Condition()
+
+    def _add(self, size: int, vectors: bool):
+        self.in_flight += size
+        if vectors:
+            self.vector_bytes += size
+        self.peak = max(self.peak, self.in_flight)
+
+    def acquire_page(self, size: int, stop: threading.Event):
+        with self._cond:
+            # An oversized page is still let through once everything else drained
+            while self.in_flight and self.in_flight + size > self.max_bytes // 2:
+                if stop.is_set():
+                    return
+                self._cond.wait(0.1)
+            self._add(size, vectors=False)
+
+    def vector_slots(self, bytes_per_vector: int, limit: int, stop: threading.Event) -> int:
+        """How many vectors the next embedding batch may produce (at least one)"""
+        if not bytes_per_vector:
+            # Dimension unknown until the first batch comes back
+            return 1
+        with self._cond:
+            # Only wait on vectors the indexer is about to release; text held
+            # upstream cannot drain until this batch is embedded
+            while self.vector_bytes and self.in_flight + bytes_per_vector > self.max_bytes:
+                if stop.is_set():
+                    break
+                self._cond.wait(0.1)
+            room = (self.max_bytes - self.in_flight) // bytes_per_vector
+            return max(1, min(limit, room))
+
+    def reserve_vectors(self, size: int):
+        with self._cond:
+            self._add(size, vectors=True)
+
+    def transfer(self, old_size: int, new_size: int):
+        """Move a page's reservation onto its chunks without blocking"""
+        with self._cond:
+            self._add(new_size - old_size, vectors=False)
+            self._cond.notify_all()
+
+    def release(self, size: int, vectors: bool = False):
+        with self._cond:
+            self.in_flight -= size
+            if vectors:
+                self.vector_bytes -= size
+            self._cond.notify_all()
+
+
+def _put(q: queue.Queue, item, stop: threading.Event) -> bool:
+    while not stop.is_set():
+        try:
+            q.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _get(q: queue.Queue, stop: threading.Event):
+    while not stop.is_set():
+        try:
+            return q.get(timeout=0.1)
+        except queue.Empty:
+            continue
+    return _DONE
+
+
+def fetch_documents(urls: Iterable[str]) -> Iterator:
+    """Yield one document per page as it is downloaded"""
+    loader = WebBaseLoader(web_paths=list(urls))
+    yield from loader.lazy_load()
+
+
+def clean_document(doc):
+    """Collapse runs of whitespace left over from HTML extraction
+
+    Blank lines are kept (at most one in a row) so the splitter can still
+    break on paragraph boundaries first.
+    """
+    text = re.sub(r"[ \t\r\f\v]+", " ", doc.page_content)
+    text = re.sub(r" *\n *", "\n", text)
+    doc.page_content = re.sub(r"\n{3,}", "\n\n", text).strip()
+    return doc
+
+
+def ingest_urls(
+    urls: Iterable[str],
+    embeddings=None,
+    batch_size: int = EMBED_BATCH_SIZE,
+    queue_size: int = QUEUE_SIZE,
+    memory_ceiling_mb: float = MEMORY_CEILING_MB,
+    chunk_size: int = 1000,
+    chunk_overlap: int = 200,
+    stats: Optional[dict] = None,
+) -> FAISS:
+    """
+    Stream pages into a FAISS index: fetch -> clean -> split -> embed -> index.
+
+    Each stage runs in its own thread behind a bounded queue, so downloads,
+    splitting and embedding calls overlap. Text and vectors held between
+    stages stay within the memory ceiling, except for a page larger than
+    the ceiling or a single vector when text has filled the budget.
+
+    Args:
+        urls: Pages to ingest
+        embeddings: Embeddings model (defaults to OpenAIEmbeddings)
+        stats: Optional dict filled with pages/chunks/peak_in_flight_bytes
+
+    Returns:
+        FAISS vector store containing every chunk
+    """
+    embeddings = embeddings or OpenAIEmbeddings()
+    text_splitter = RecursiveCharacterTextSplitter(
+        chunk_size=chunk_size, chunk_overlap=chunk_overlap
+    )
+    budget = MemoryBudget(int(memory_ceiling_mb * 1024 * 1024))
+    stop = threading.Event()
+    errors = []
+    pages = queue.Queue(maxsize=queue_size)
+    chunks = queue.Queue(maxsize=queue_size * batch_size)
+    batches = queue.Queue(maxsize=queue_size)
+    counts = {"pages": 0, "chunks": 0}
+
+    def page_reservation(doc) -> int:
+        # Chunk overlap makes the chunks longer than the page they came from
+        return len(doc.page_content) * chunk_size // max(chunk_size - chunk_overlap, 1)
+
+    def fetch_stage():
+        for doc in fetch_documents(urls):
+            doc = clean_document(doc)
+            if not doc.page_content:
+                continue
+            budget.acquire_page(page_reservation(doc), stop)
+            if not _put(pages, doc, stop):
+                return
+            counts["pages"] += 1
+
+    def split_stage():
+        while (doc := _get(pages, stop)) is not _DONE:
+            splits = text_splitter.split_documents([doc])
+            budget.transfer(
+                page_reservation(doc), sum(len(split.page_content) for split in splits)
+            )
+            for split in splits:
+                if not _put(chunks, split, stop):
+                    return
+
+    def embed_stage():
+        finished = False
+        bytes_per_vector = 0  # learned from the first batch
+        while not finished:
+            batch = [_get(chunks, stop)]
+            if batch[0] is _DONE:
+                break
+            # Take whatever is already queued rather than waiting for a full
+            # batch, so a saturated budget can never stall the pipeline, and
+            # no more than the vectors the budget has room for
+            limit = budget.vector_slots(bytes_per_vector, batch_size, stop)
+            while len(batch) < limit:
+                try:
+                    split = chunks.get_nowait()
+                except queue.Empty:
+                    break
+                if split is _DONE:
+                    finished = True
+                    break
+                batch.append(split)
+            reserved = len(batch) * bytes_per_vector
+            budget.reserve_vectors(reserved)
+            vectors = embeddings.embed_documents([split.page_content for split in batch])
+            if not bytes_per_vector and vectors:
+                bytes_per_vector = len(vectors[0]) * VECTOR_BYTES_PER_DIM
+                budget.reserve_vectors(len(batch) * bytes_per_vector - reserved)
+                reserved = len(batch) * bytes_per_vector
+            if not _put(batches, (batch, vectors, reserved), stop):
+                return
+
+    def run(stage, out_q):
+        try:
+            stage()
+        except Exception as e:
+            errors.append(e)
+            stop.set()
+        finally:
+            _put(out_q, _DONE, stop)
+
+    workers = [
+        threading.Thread(target=run, args=(fetch_stage, pages), daemon=True),
+        threading.Thread(target=run, args=(split_stage, chunks), daemon=True),
+        threading.Thread(target=run, args=(embed_stage, batches), daemon=True),
+    ]
+    for worker in workers:
+        worker.start()
+
+    vectorstore = None
+    try:
+        while (item := _get(batches, stop)) is not _DONE:
+            batch, vectors, vector_bytes = item
+            text_embeddings = [
+                (split.page_content, vector) for split, vector in zip(batch, vectors)
+            ]
+            metadatas = [split.metadata for split in batch]
+            if vectorstore is None:
+                vectorstore = FAISS.from_embeddings(
+                    text_embeddings, embeddings, metadatas=metadatas
+                )
+            else:
+                vectorstore.add_embeddings(text_embeddings, metadatas=metadatas)
+            counts["chunks"] += len(batch)
+            budget.release(sum(len(split.page_content) for split in batch))
+            budget.release(vector_bytes, vectors=True)
+    except BaseException:
+        stop.set()
+        raise
+    finally:
+        for worker in workers:
+            worker.join()
+
+    if errors:
+        raise errors[0]
+    if vectorstore is None:
+        raise ValueError("No content could be loaded from the given URLs")
+    if stats is not None:
+        stats.update(counts, peak_in_flight_bytes=budget.peak)
+    return vectorstore
@@ -0,0 +1,244 @@
+from collections import OrderedDict
+from dotenv import load_dotenv
+from typing import Any, Callable, List, Optional, Sequence
+import hashlib
+import json
+import math
+import operator
+import os
+import threading
+
+# Load environment variables
+load_dotenv()
+
+# Cache settings (override in .env)
+CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "1024"))
+# Cosine similarity needed for a semantic hit; leave unset to disable that tier
+SEMANTIC_THRESHOLD = os.getenv("LLM_CACHE_SEMANTIC_THRESHOLD")
+EMBEDDING_MODEL = os.getenv("LLM_CACHE_EMBEDDING_MODEL", "text-embedding-3-small")
+
+
+def normalize_text(text: str) -> str:
+    """Collapse whitespace so formatting-only differences share a cache key"""
+    return " ".join(str(text).split())
+
+
+def normalize_messages(messages) -> str:
+    """Turn OpenAI-style message dicts into a stable, whitespace-normalized string"""
+    return "\n".join(
+        f"{m.get('role', '')}: {normalize_text(m.get('content', ''))}" for m in messages
+    )
+
+
+def _dot(a: Sequence[float], b: Sequence[float]) -> float:
+    """Cosine similarity of two unit vectors"""
+    return sum(map(operator.mul, a, b))
+
+
+def openai_embedder(model: str = EMBEDDING_MODEL) -> Callable[[str], List[float]]:
+    """Default embedding function for the semantic tier"""
+    from openai import OpenAI
+
+    client = OpenAI()
+
+    def embed(text: str) -> List[float]:
+        return client.embeddings.create(model=model, input=text).data[0].embedding
+
+    return embed
+
+
+class ResponseCache:
+    """
+    Two-tier LRU cache for deterministic LLM responses.
+
+    The exact tier is keyed by model plus normalized prompt. When an
+    embedding function and similarity threshold are given, a miss falls
+    back to the most similar stored prompt for the same model.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = CACHE_MAX_ENTRIES,
+        embed: Optional[Callable[[str], Sequence[float]]] = None,
+        similarity_threshold: Optional[float] = None,
+    ):
+        self.max_entries = max_entries
+        self.embed = embed
+        self.similarity_threshold = similarity_threshold
+        self._entries = OrderedDict()
+        self._pending = OrderedDict()
+        self._lock = threading.Lock()
+        self.exact_hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def semantic_enabled(self) -> bool:
+        return self.embed is not None and self.similarity_threshold is not None
+
+    @staticmethod
+    def _key(model: str, prompt: str) -> str:
+        return hashlib.sha256(f"{model}\x00{prompt}".encode("utf-8")).hexdigest()
+
+    def _embed(self, prompt: str) -> Optional[List[float]]:
+        """Embed and normalize once, so similarity is a plain dot product"""
+        try:
+            vector = list(self.embed(prompt))
+        except Exception as e:
+            print(f"⚠️ Semantic cache skipped for this call: {e}")
+            return None
+        norm = math.sqrt(sum(x * x for x in vector))
+        if not norm:
+            return None
+        return [x / norm for x in vector]
+
+    def _lookup(self, model: str, prompt: str):
+        """Return (value, embedding); the prompt is only embedded on an exact miss"""
+        key = self._key(model, prompt)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.exact_hits += 1
+                return entry["value"], entry["embedding"]
+
+        embedding = self._embed(prompt) if self.semantic_enabled else None
+        best_key, best_score = None, self.similarity_threshold
+        if embedding is not None:
+            # Score a snapshot outside the lock so exact hits in other
+            # threads are never blocked behind the similarity scan
+            with self._lock:
+                candidates = [
+                    (other_key, entry["embedding"])
+                    for other_key, entry in self._entries.items()
+                    if entry["model"] == model and entry["embedding"] is not None
+                ]
+            for other_key, other in candidates:
+                score = _dot(embedding, other)
+                if score >= best_score:
+                    best_key, best_score = other_key, score
+
+        with self._lock:
+            # The best match may have been evicted while we were scoring
+            if best_key is not None and best_key in self._entries:
+                self._entries.move_to_end(best_key)
+                self.semantic_hits += 1
+                value = self._entries[best_key]["value"]
+                # Alias the match under this exact key so repeats of the same
+                # near-duplicate skip the embedding call and the scan
+                self._store(key, model, value, embedding)
+                return value, embedding
+            self.misses += 1
+            if embedding is not None:
+                # Keep the vector around so the following put() needn't re-embed
+                self._pending[key] = embedding
+                while len(self._pending) > self.max_entries:
+                    self._pending.popitem(last=False)
+        return None, embedding
+
+    def get(self, model: str, prompt: str) -> Optional[Any]:
+        """Look up a response by exact key, then by prompt similarity"""
+        return self._lookup(model, prompt)[0]
+
+    def put(self, model: str, prompt: str, value: Any, embedding=None):
+        """Store a response, evicting the least recently used entries"""
+        key = self._key(model, prompt)
+        with self._lock:
+            if embedding is None:
+                embedding = self._pending.pop(key, None)
+        if self.semantic_enabled and embedding is None:
+            embedding = self._embed(prompt)
+        with self._lock:
+            self._store(key, model, value, embedding)
+
+    def _store(self, key: str, model: str, value: Any, embedding):
+        """Insert under the lock, evicting the least recently used entries"""
+        self._entries[key] = {"model": model, "value": value, "embedding": embedding}
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def get_or_call(self, model: str, prompt: str, call: Callable[[], Any]) -> Any:
+        """Return a cached response or compute, store and return a fresh one"""
+        value, embedding = self._lookup(model, prompt)
+        if value is None:
+            value = call()
+            self.put(model, prompt, value, embedding=embedding)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._pending.clear()
+
+    def stats(self) -> dict:
+        """Hit-rate metrics for monitoring"""
+        with self._lock:
+            hits = self.exact_hits + self.semantic_hits
+            lookups = hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "exact_hits": self.exact_hits,
+                "semantic_hits": self.semantic_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": hits / lookups if lookups else 0.0,
+                "semantic_enabled": self.semantic_enabled,
+            }
+
+
+_shared_cache = None
+_shared_lock = threading.Lock()
+
+
+def get_response_cache() -> ResponseCache:
+    """Process-wide cache shared by every get_llm instance"""
+    global _shared_cache
+    with _shared_lock:
+        if _shared_cache is None:
+            if SEMANTIC_THRESHOLD:
+                _shared_cache = ResponseCache(
+                    embed=openai_embedder(),
+                    similarity_threshold=float(SEMANTIC_THRESHOLD),
+                )
+            else:
+                _shared_cache = ResponseCache()
+        return _shared_cache
+
+
+def _prompt_text(prompt: str) -> str:
+    """Extract message contents from a LangChain-serialized prompt"""
+    try:
+        messages = json.loads(prompt)
+    except (TypeError, ValueError):
+        return normalize_text(prompt)
+    if not isinstance(messages, list):
+        return normalize_text(prompt)
+    parts = []
+    for message in messages:
+        kwargs = message.get("kwargs", {}) if isinstance(message, dict) else {}
+        parts.append(f"{kwargs.get('type', '')}: {normalize_text(kwargs.get('content', ''))}")
+    return "\n".join(parts)
+
+
+def langchain_cache(cache: Optional[ResponseCache] = None):
+    """Wrap a ResponseCache as a LangChain BaseCache for chat model `cache=`"""
+    from langchain_core.caches import BaseCache
+
+    class _LangChainResponseCache(BaseCache):
+        def __init__(self, backend: ResponseCache):
+            self.backend = backend
+
+        def lookup(self, prompt: str, llm_string: str):
+            return self.backend.get(llm_string, _prompt_text(prompt))
+
+        def update(self, prompt: str, llm_string: str, return_val):
+            self.backend.put(llm_string, _prompt_text(prompt), return_val)
+
+        def clear(self, **kwargs):
+            self.backend.clear()
+
+    return _LangChainResponseCache(cache or get_response_cache())
@@ -3,6 +3,7 @@ from langchain_ollama import ChatOllama  # Updated import
 from dotenv import load_dotenv
 import os
 from pathlib import Path
+from llm_cache import langchain_cache
 
 # Load environment variables
 load_dotenv()
@@ -10,22 +11,28 @@ load_dotenv()
 # Default model setting
 DEFAULT_MODEL = "llama"  # Options: "llama" or "gpt"
 
-def get_llm(temperature=0, model=DEFAULT_MODEL):
-    """Get LLM instance with specified temperature"""
+def get_llm(temperature=0, model=DEFAULT_MODEL, use_cache=True):
+    """Get LLM instance with specified temperature
+
+    Deterministic (temperature 0) instances share the response cache
+    unless use_cache is False.
+    """
+    cache = langchain_cache() if use_cache and temperature == 0 else False
     if model == "llama":
         return ChatOllama(
             model="llama3.1",  # or any other model you have in Ollama
-            temperature=temperature
+            temperature=temperature,
+            cache=cache
         )
-    return ChatOpenAI(model="gpt-3.5-turbo", temperature=temperature)
+    return ChatOpenAI(model="gpt-3.5-turbo", temperature=temperature, cache=cache)
 
 
-def get_rag_chain(retriever, prompt):
+def get_rag_chain(retriever, prompt, use_cache=True):
     """Create a RAG chain with given prompt and retriever"""
     from langchain.chains.combine_documents import create_stuff_documents_chain
     from langchain.chains import create_retrieval_chain
 
-    llm = get_llm()
+    llm = get_llm(use_cache=use_cache)
     chain = create_stuff_documents_chain(llm, prompt)
     retrieval_chain = create_retrieval_chain(retriever, chain)
 
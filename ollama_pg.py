@@ -4,18 +4,49 @@ from langchain_core.messages import HumanMessage, SystemMessage, AIMessage
 from langchain_core.output_parsers import StrOutputParser
 import ollama
 
+from chat_context import SUMMARY_MAX_TOKENS, cap_summary, plan_context
+
 st.set_page_config(page_title="🤖 Ollama Chat Bot", page_icon="🤖")
 
 
 """
 This is a simple chatbot that uses Ollama to generate responses to user messages.
 """
-AVAILABLE_MODELS = ["llama3.1"]
+MODEL_LIST_TTL = 60  # seconds between Ollama model discovery calls
+PAGE_SIZE = 50  # messages rendered per "show earlier" step
+
+
+@st.cache_data(ttl=MODEL_LIST_TTL, show_spinner=False)
+def list_models():
+    """Ask the Ollama server which models are installed
+
+    Connection errors propagate so Streamlit doesn't cache them.
+    """
+    response = ollama.list()
+    models = response.get("models", []) if isinstance(response, dict) else response.models
+    names = []
+    for model in models:
+        if isinstance(model, dict):
+            names.append(model.get("model") or model.get("name"))
+        else:
+            names.append(model.model)
+    return [name for name in names if name]
+
+
+@st.cache_resource(show_spinner=False)
+def get_chat_model(model, temperature=0.7):
+    """One client per model, reused across Streamlit reruns"""
+    return ChatOllama(model=model, temperature=temperature)
 
 
 def get_models():
-    models = AVAILABLE_MODELS
+    try:
+        models = list_models()
+    except Exception:
+        models = []
     if not models:
+        # Don't keep an empty listing around once models are pulled
+        list_models.clear()
         st.error("No models found. Please start Ollama server.")
         st.stop()
     models_list = []
@@ -25,20 +56,86 @@ def get_models():
     return models_list
 
 
+def summarize_turns(llm, summary, turns):
+    """Fold older turns into the rolling conversation summary"""
+    transcript = "\n".join(
+        f"{'User' if isinstance(msg, HumanMessage) else 'Assistant'}: {msg.content}"
+        for msg in turns
+    )
+    messages = [
+        SystemMessage(
+            content="You maintain a concise running summary of a conversation. "
+            "Keep facts, names, decisions and open questions; drop small talk. "
+            f"Stay under {SUMMARY_MAX_TOKENS * 3 // 4} words."
+        ),
+        HumanMessage(
+            content=f"Current summary:\n{summary or '(none)'}\n\n"
+            f"New turns:\n{transcript}\n\nReturn the updated summary only."
+        ),
+    ]
+    return cap_summary((llm | StrOutputParser()).invoke(messages))
+
+
+def build_context(model):
+    """
+    Messages to send with the next prompt: the rolling summary plus a
+    sliding window of recent turns, together within MAX_CONTEXT_TOKENS.
+    """
+    history = st.session_state["chat_history"]
+    start = st.session_state["summarized_upto"]
+    cut = plan_context(history, start, st.session_state["summary"])
+    if cut > start:
+        st.session_state["summary"] = summarize_turns(
+            get_chat_model(model, temperature=0),
+            st.session_state["summary"],
+            history[start:cut],
+        )
+        st.session_state["summarized_upto"] = cut
+    window = history[cut:]
+
+    context = []
+    if st.session_state["summary"]:
+        context.append(
+            SystemMessage(
+                content=f"Summary of the earlier conversation:\n{st.session_state['summary']}"
+            )
+        )
+    return context + window
+
+
+def show_earlier():
+    st.session_state["visible_messages"] += PAGE_SIZE
+
+
+def render_message(msg):
+    if isinstance(msg, AIMessage):
+        with st.chat_message("assistant"):
+            st.write(msg.content)
+    if isinstance(msg, HumanMessage):
+        with st.chat_message("user"):
+            st.write(msg.content)
+
+
 def init_session():
 
     if "chat_history" not in st.session_state:
         st.session_state["chat_history"] = [
             AIMessage(content="Hello, how can I assist you today?")
         ]
+    st.session_state.setdefault("summary", "")
+    st.session_state.setdefault("summarized_upto", 0)
+    st.session_state.setdefault("visible_messages", PAGE_SIZE)
+
+    # Only the tail of a long conversation is rendered on each rerun
+    history = st.session_state["chat_history"]
+    hidden = max(len(history) - st.session_state["visible_messages"], 0)
+    if hidden:
+        st.button(
+            f"Show earlier messages ({hidden} hidden)", on_click=show_earlier
+        )
 
-    for msg in st.session_state["chat_history"]:
-        if isinstance(msg, AIMessage):
-            with st.chat_message("assistant"):
-                st.write(msg.content)
-        if isinstance(msg, HumanMessage):
-            with st.chat_message("user"):
-                st.write(msg.content)
+    for msg in history[hidden:]:
+        render_message(msg)
 
 
 def run_app():
@@ -54,12 +151,12 @@ def run_app():
 
     selected_model = st.session_state["selected_model"]
 
-    llm = ChatOllama(model=selected_model, temperature=0.7)
+    llm = get_chat_model(selected_model)
 
     if prompt:
         st.chat_message("user").write(prompt)
         st.session_state["chat_history"].append(HumanMessage(content=prompt))
-        response = llm.stream([HumanMessage(content=prompt)])
+        response = llm.stream(build_context(selected_model))
 
         with st.chat_message("assistant"):
             op = st.write_stream(response)
@@ -0,0 +1,195 @@
+from dotenv import load_dotenv
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlparse
+import hashlib
+import json
+import os
+import threading
+import time
+
+# Load environment variables
+load_dotenv()
+
+# Cache settings (override in .env)
+CACHE_DIR = os.getenv("REVIEW_CACHE_DIR", "output/review_cache")
+# Reviews not revalidated within this many seconds are regenerated on request
+MAX_AGE = int(os.getenv("REVIEW_CACHE_MAX_AGE", str(24 * 3600)))
+# Request counts halve over this many seconds, so popularity follows recent traffic
+POPULARITY_HALF_LIFE = int(os.getenv("REVIEW_POPULARITY_HALF_LIFE", str(24 * 3600)))
+# Seconds between popularity flushes from each process
+POPULARITY_FLUSH_INTERVAL = 30
+# URLs whose decayed count falls below this are forgotten
+POPULARITY_MIN_SCORE = 0.05
+POPULARITY_MAX_URLS = 5000
+POPULARITY_SHARD_MAX_AGE = 4 * POPULARITY_HALF_LIFE
+# Share of a URL's domain score added to its own when ranking what to warm
+POPULARITY_DOMAIN_WEIGHT = float(os.getenv("REVIEW_POPULARITY_DOMAIN_WEIGHT", "0.5"))
+
+
+def normalize_url(url: str) -> str:
+    """Match the protocol handling in review_url"""
+    if not url.startswith(("http://", "https://")):
+        url = "https://" + url
+    return url
+
+
+def get_domain(url: str) -> str:
+    return urlparse(normalize_url(url)).netloc.replace("www.", "")
+
+
+def write_json_atomic(path: Path, data: Any, indent: Optional[int] = 2):
+    """Write atomically so a worker process never reads a partial file"""
+    tmp = path.with_suffix(f".{os.getpid()}.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=indent, ensure_ascii=False)
+    os.replace(tmp, path)
+
+
+class ReviewStore:
+    """
+    Finished reviews on disk, one JSON file per URL, together with the
+    validators (ETag, Last-Modified, content hash) used to revalidate them.
+    """
+
+    def __init__(self, cache_dir: str = CACHE_DIR, max_age: int = MAX_AGE):
+        self.dir = Path(cache_dir)
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self.max_age = max_age
+        self._lock = threading.Lock()
+
+    def _path(self, url: str) -> Path:
+        key = hashlib.sha256(normalize_url(url).encode("utf-8")).hexdigest()[:24]
+        return self.dir / f"{key}.json"
+
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        path = self._path(url)
+        try:
+            with open(path, encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def get_fresh_review(self, url: str) -> Optional[Dict[str, Any]]:
+        """Return the cached review if it was validated within max_age"""
+        entry = self.get(url)
+        if entry is None or time.time() - entry["checked_at"] > self.max_age:
+            return None
+        return entry["review"]
+
+    def put(self, url: str, review: Dict[str, Any], **validators):
+        now = time.time()
+        entry = {
+            "url": normalize_url(url),
+            "review": review,
+            "etag": validators.get("etag"),
+            "last_modified": validators.get("last_modified"),
+            "content_hash": validators.get("content_hash"),
+            "generated_at": datetime.now().isoformat(),
+            "checked_at": now,
+        }
+        with self._lock:
+            write_json_atomic(self._path(url), entry)
+
+    def mark_checked(self, url: str, **validators):
+        """Record a revalidation that found the content unchanged"""
+        with self._lock:
+            entry = self.get(url)
+            if entry is None:
+                return
+            for name, value in validators.items():
+                if value is not None:
+                    entry[name] = value
+            entry["checked_at"] = time.time()
+            write_json_atomic(self._path(url), entry)
+
+
+class PopularityTracker:
+    """
+    Exponentially decayed request counts per URL, summed per domain when
+    ranking.
+
+    record() only touches memory. save() is called from the warmer thread
+    and writes this process's counts to its own shard file, so several API
+    workers never overwrite each other; top_urls() merges every shard.
+    """
+
+    def __init__(self, cache_dir: str = CACHE_DIR, half_life: int = POPULARITY_HALF_LIFE):
+        self.dir = Path(cache_dir)
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self.path = self.dir / f"popularity.{os.getpid()}.json"
+        self.half_life = half_life
+        self._urls = {}  # url -> [score, updated]
+        self._dirty = False
+        self._lock = threading.Lock()
+
+    def _decayed(self, score: float, since: float, now: float) -> float:
+        return score * 0.5 ** ((now - since) / self.half_life)
+
+    def record(self, url: str):
+        url = normalize_url(url)
+        now = time.time()
+        with self._lock:
+            score, updated = self._urls.get(url, (0.0, now))
+            self._urls[url] = [self._decayed(score, updated, now) + 1, now]
+            self._dirty = True
+
+    def _prune(self, urls: Dict[str, list], now: float) -> Dict[str, list]:
+        """Drop URLs that decayed to noise and keep at most POPULARITY_MAX_URLS"""
+        scored = {
+            url: [self._decayed(score, updated, now), now]
+            for url, (score, updated) in urls.items()
+        }
+        scored = {url: v for url, v in scored.items() if v[0] >= POPULARITY_MIN_SCORE}
+        if len(scored) > POPULARITY_MAX_URLS:
+            keep = sorted(scored, key=lambda url: scored[url][0], reverse=True)
+            scored = {url: scored[url] for url in keep[:POPULARITY_MAX_URLS]}
+        return scored
+
+    def save(self):
+        """Write this process's shard; runs off the request path"""
+        now = time.time()
+        with self._lock:
+            if not self._dirty:
+                return
+            self._urls = self._prune(self._urls, now)
+            snapshot = dict(self._urls)
+            self._dirty = False
+        write_json_atomic(self.path, snapshot, indent=None)
+
+    def _merged(self, now: float) -> Dict[str, float]:
+        """Decayed scores summed over every live shard"""
+        merged = {}
+        for shard in self.dir.glob("popularity.*.json"):
+            try:
+                if now - shard.stat().st_mtime > POPULARITY_SHARD_MAX_AGE:
+                    # Left behind by a worker that exited
+                    shard.unlink()
+                    continue
+                with open(shard, encoding="utf-8") as f:
+                    urls = json.load(f)
+            except (OSError, ValueError):
+                continue
+            for url, (score, updated) in urls.items():
+                merged[url] = merged.get(url, 0.0) + self._decayed(score, updated, now)
+        return merged
+
+    def top_urls(self, limit: int) -> List[str]:
+        """
+        The `limit` URLs most worth warming: each URL's decayed score plus
+        POPULARITY_DOMAIN_WEIGHT times its domain's, so pages of a busy
+        domain rank ahead of equally busy pages on a quiet one.
+        """
+        self.save()
+        scores = self._merged(time.time())
+        domains = {}
+        for url, score in scores.items():
+            domain = get_domain(url)
+            domains[domain] = domains.get(domain, 0.0) + score
+        ranked = sorted(
+            scores,
+            key=lambda url: scores[url] + POPULARITY_DOMAIN_WEIGHT * domains[get_domain(url)],
+            reverse=True,
+        )
+        return ranked[:limit]
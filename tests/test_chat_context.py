@@ -0,0 +1,50 @@
+from langchain_core.messages import AIMessage, HumanMessage
+
+from chat_context import estimate_tokens, plan_context
+
+
+def _turns(count, chars=400):
+    return [
+        (HumanMessage if i % 2 == 0 else AIMessage)(content="x" * chars)
+        for i in range(count)
+    ]
+
+
+def _context_tokens(history, cut, summary):
+    summary_tokens = estimate_tokens(summary) if summary else 0
+    return summary_tokens + sum(estimate_tokens(msg.content) for msg in history[cut:])
+
+
+def test_window_within_budget_is_left_alone():
+    history = _turns(4)
+    assert plan_context(history, 0, "", max_tokens=1000, target_tokens=500) == 0
+
+
+def test_over_budget_folds_down_to_target_and_keeps_prompt():
+    history = _turns(20)  # 101 tokens each
+    cut = plan_context(history, 0, "", max_tokens=1000, target_tokens=500)
+
+    assert 0 < cut < len(history)
+    assert _context_tokens(history, cut, "") <= 500
+
+
+def test_summary_counts_against_the_budget():
+    history = _turns(8)  # 808 tokens of history
+    summary = "s" * 1200  # 301 tokens
+
+    assert plan_context(history, 0, "", max_tokens=1000, target_tokens=500) == 0
+    cut = plan_context(history, 0, summary, max_tokens=1000, target_tokens=500)
+    assert cut > 0
+    assert _context_tokens(history, cut, summary) <= 500
+
+
+def test_folding_starts_after_already_summarized_turns():
+    history = _turns(30)
+    cut = plan_context(history, 10, "", max_tokens=1000, target_tokens=500)
+    assert 10 < cut < len(history)
+
+
+def test_oversized_prompt_is_kept_verbatim():
+    history = _turns(4) + [HumanMessage(content="y" * 10_000)]
+    cut = plan_context(history, 0, "", max_tokens=1000, target_tokens=500)
+    assert cut == len(history) - 1
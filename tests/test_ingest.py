@@ -0,0 +1,86 @@
+import threading
+
+import pytest
+
+pytest.importorskip("faiss")
+from langchain_community.embeddings import FakeEmbeddings
+from langchain_core.documents import Document
+
+import ingest
+
+
+def _run_with_timeout(timeout=30, **kwargs):
+    result = {}
+
+    def target():
+        try:
+            result["vectorstore"] = ingest.ingest_urls(**kwargs)
+        except Exception as e:
+            result["error"] = e
+
+    thread = threading.Thread(target=target, daemon=True)
+    thread.start()
+    thread.join(timeout)
+    assert not thread.is_alive(), "ingest pipeline deadlocked"
+    if "error" in result:
+        raise result["error"]
+    return result["vectorstore"]
+
+
+@pytest.mark.parametrize("page_chars", [20_000, 200_000])
+def test_pages_larger_than_ceiling_do_not_deadlock(monkeypatch, page_chars):
+    pages = 20
+    monkeypatch.setattr(
+        ingest,
+        "fetch_documents",
+        lambda urls: (
+            Document(page_content=("word " * (page_chars // 5)).strip(), metadata={"source": u})
+            for u in urls
+        ),
+    )
+    stats = {}
+    vectorstore = _run_with_timeout(
+        urls=[f"https://example.com/{i}" for i in range(pages)],
+        embeddings=FakeEmbeddings(size=32),
+        memory_ceiling_mb=0.01,
+        batch_size=8,
+        stats=stats,
+    )
+    assert stats["pages"] == pages
+    assert vectorstore.index.ntotal == stats["chunks"]
+
+
+def test_peak_stays_within_ceiling_for_normal_pages(monkeypatch):
+    ceiling_mb = 0.5
+    monkeypatch.setattr(
+        ingest,
+        "fetch_documents",
+        lambda urls: (
+            Document(page_content=("word " * 4_000).strip(), metadata={"source": u})
+            for u in urls
+        ),
+    )
+    stats = {}
+    _run_with_timeout(
+        urls=[f"https://example.com/{i}" for i in range(30)],
+        embeddings=FakeEmbeddings(size=1536),
+        memory_ceiling_mb=ceiling_mb,
+        stats=stats,
+    )
+    one_vector = 1536 * ingest.VECTOR_BYTES_PER_DIM
+    assert stats["peak_in_flight_bytes"] <= ceiling_mb * 1024 * 1024 + one_vector
+
+
+def test_clean_document_keeps_paragraph_breaks():
+    doc = Document(page_content="  Title \n\n\n\n First   para\n  line two \n \n Second ")
+    assert ingest.clean_document(doc).page_content == "Title\n\nFirst para\nline two\n\nSecond"
+
+
+def test_stage_errors_are_raised(monkeypatch):
+    def fetch(urls):
+        yield Document(page_content="some text")
+        raise RuntimeError("fetch failed")
+
+    monkeypatch.setattr(ingest, "fetch_documents", fetch)
+    with pytest.raises(RuntimeError, match="fetch failed"):
+        _run_with_timeout(urls=["https://example.com"], embeddings=FakeEmbeddings(size=32))
@@ -0,0 +1,117 @@
+import pytest
+
+from llm_cache import ResponseCache, _prompt_text, langchain_cache
+
+
+class FakeEmbedder:
+    """Embeds text as letter counts and records every call"""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, text):
+        self.calls.append(text)
+        return [text.count("a"), text.count("b"), 1]
+
+
+def _counter():
+    calls = []
+
+    def call():
+        calls.append(1)
+        return f"response {len(calls)}"
+
+    return call, calls
+
+
+def test_exact_tier_hits_and_evicts_least_recently_used():
+    cache = ResponseCache(max_entries=2)
+    cache.put("m", "one", 1)
+    cache.put("m", "two", 2)
+    assert cache.get("m", "one") == 1  # "two" is now least recently used
+    cache.put("m", "three", 3)
+
+    assert cache.get("m", "two") is None
+    assert cache.get("m", "one") == 1
+    stats = cache.stats()
+    assert stats["evictions"] == 1
+    assert stats["exact_hits"] == 2
+    assert stats["misses"] == 1
+    assert not stats["semantic_enabled"]
+
+
+def test_semantic_tier_respects_threshold_and_model():
+    cache = ResponseCache(embed=FakeEmbedder(), similarity_threshold=0.99)
+    call, calls = _counter()
+
+    assert cache.get_or_call("m", "aab", call) == "response 1"
+    assert cache.get_or_call("m", "aba", call) == "response 1"  # same letter counts
+    assert cache.get_or_call("m", "bbb", call) == "response 2"  # below threshold
+    assert cache.get_or_call("other", "aab", call) == "response 3"  # scoped by model
+    assert len(calls) == 3
+    assert cache.stats()["semantic_hits"] == 1
+
+
+def test_semantic_hit_is_aliased_under_exact_key():
+    embedder = FakeEmbedder()
+    cache = ResponseCache(embed=embedder, similarity_threshold=0.99)
+    cache.put("m", "aab", "stored")
+    embedder.calls.clear()
+
+    assert cache.get("m", "aba") == "stored"
+    assert cache.get("m", "aba") == "stored"
+    assert embedder.calls == ["aba"]
+    assert cache.stats()["exact_hits"] == 1
+
+
+def test_miss_embedding_is_reused_by_put():
+    embedder = FakeEmbedder()
+    cache = ResponseCache(embed=embedder, similarity_threshold=0.99)
+    call, _ = _counter()
+
+    cache.get_or_call("m", "aab", call)
+    assert embedder.calls == ["aab"]
+
+    assert cache.get("m", "bbb") is None
+    cache.put("m", "bbb", "later")
+    assert embedder.calls == ["aab", "bbb"]
+
+
+def test_failing_embedder_falls_back_to_exact_tier():
+    def broken(text):
+        raise RuntimeError("embedding service down")
+
+    cache = ResponseCache(embed=broken, similarity_threshold=0.9)
+    call, calls = _counter()
+    cache.get_or_call("m", "prompt", call)
+    cache.get_or_call("m", "prompt", call)
+    assert len(calls) == 1
+
+
+def test_prompt_text_reads_langchain_serialized_messages():
+    from langchain_core.load import dumps
+    from langchain_core.messages import HumanMessage, SystemMessage
+
+    prompt = dumps([SystemMessage(content="Be  brief."), HumanMessage(content=" hi\n there ")])
+    assert _prompt_text(prompt) == "system: Be brief.\nhuman: hi there"
+
+
+def test_langchain_cache_serves_whitespace_variants():
+    from langchain_core.language_models import FakeListChatModel
+
+    llm = FakeListChatModel(
+        responses=["first", "second"], cache=langchain_cache(ResponseCache())
+    )
+    assert llm.invoke("categorize  this tool").content == "first"
+    assert llm.invoke("categorize this\ntool").content == "first"
+    assert llm.invoke("something else").content == "second"
+
+
+def test_get_llm_only_caches_deterministic_calls():
+    pytest.importorskip("langchain_ollama")
+    from langchain_core.caches import BaseCache
+    from llm_config import get_llm
+
+    assert isinstance(get_llm().cache, BaseCache)
+    assert get_llm(use_cache=False).cache is False
+    assert get_llm(temperature=0.7).cache is False
@@ -0,0 +1,66 @@
+import json
+import time
+
+import review_cache
+from review_cache import PopularityTracker, ReviewStore
+
+
+def test_top_urls_ranks_urls_across_domains(tmp_path):
+    tracker = PopularityTracker(str(tmp_path))
+    for url, hits in [
+        ("https://big.io/a", 5),
+        ("https://big.io/b", 4),
+        ("https://small.io/x", 3),
+    ]:
+        for _ in range(hits):
+            tracker.record(url)
+
+    assert tracker.top_urls(2) == ["https://big.io/a", "https://big.io/b"]
+
+
+def test_top_urls_favours_pages_of_busy_domains(tmp_path):
+    tracker = PopularityTracker(str(tmp_path))
+    for url, hits in [
+        ("https://busy.io/a", 3),
+        ("https://busy.io/b", 3),
+        ("https://busy.io/c", 3),
+        ("https://quiet.io/x", 4),
+    ]:
+        for _ in range(hits):
+            tracker.record(url)
+
+    # quiet.io/x has the most hits of any single URL, but busy.io's
+    # domain traffic lifts its pages ahead
+    assert tracker.top_urls(4)[-1] == "https://quiet.io/x"
+
+
+def test_top_urls_merges_shards_from_other_workers(tmp_path):
+    tracker = PopularityTracker(str(tmp_path))
+    tracker.record("https://a.io")
+    (tmp_path / "popularity.999999.json").write_text(
+        json.dumps({"https://b.io": [3.0, time.time()]})
+    )
+
+    assert tracker.top_urls(2) == ["https://b.io", "https://a.io"]
+
+
+def test_save_prunes_decayed_urls(tmp_path, monkeypatch):
+    now = time.time()
+    monkeypatch.setattr(review_cache.time, "time", lambda: now - 60)
+    tracker = PopularityTracker(str(tmp_path), half_life=1)
+    tracker.record("https://old.io")  # sixty half-lives before the save
+    monkeypatch.setattr(review_cache.time, "time", lambda: now)
+    tracker.record("https://new.io")
+    tracker.save()
+
+    assert list(json.loads(tracker.path.read_text())) == ["https://new.io"]
+
+
+def test_get_fresh_review_expires_after_max_age(tmp_path, monkeypatch):
+    store = ReviewStore(str(tmp_path), max_age=60)
+    store.put("tool.io", {"url": "https://tool.io"})
+    assert store.get_fresh_review("https://tool.io") == {"url": "https://tool.io"}
+
+    later = time.time() + 61
+    monkeypatch.setattr(review_cache.time, "time", lambda: later)
+    assert store.get_fresh_review("https://tool.io") is None
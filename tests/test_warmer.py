@@ -0,0 +1,133 @@
+import time
+
+import pytest
+
+pytest.importorskip("bs4")
+import warmer
+from review_cache import PopularityTracker, ReviewStore
+from warmer import CacheWarmer, LLMBudget, content_hash, revalidate
+
+
+class FakeResponse:
+    def __init__(self, status_code=200, text="", headers=None):
+        self.status_code = status_code
+        self.text = text
+        self.headers = headers or {}
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(f"HTTP {self.status_code}")
+
+
+@pytest.fixture
+def fake_get(monkeypatch):
+    """Serve one canned response and record the request headers"""
+    calls = []
+
+    def install(response):
+        def get(url, headers=None, timeout=None):
+            calls.append(headers or {})
+            return response
+
+        monkeypatch.setattr(warmer.requests, "get", get)
+        return calls
+
+    return install
+
+
+def test_not_modified_is_unchanged_and_sends_validators(fake_get):
+    calls = fake_get(FakeResponse(status_code=304))
+    entry = {"etag": '"v1"', "last_modified": "Mon, 01 Jan 2024 00:00:00 GMT"}
+
+    assert revalidate("https://tool.io", entry) == (False, {})
+    assert calls == [
+        {"If-None-Match": '"v1"', "If-Modified-Since": "Mon, 01 Jan 2024 00:00:00 GMT"}
+    ]
+
+
+def test_entry_without_hash_adopts_current_page_as_baseline(fake_get):
+    fake_get(FakeResponse(text="<p>Pricing</p>", headers={"ETag": '"v2"'}))
+
+    changed, validators = revalidate("https://tool.io", {"content_hash": None})
+    assert not changed
+    assert validators["etag"] == '"v2"'
+    assert validators["content_hash"] == content_hash("<p>Pricing</p>")
+
+
+def test_hash_change_means_changed(fake_get):
+    fake_get(FakeResponse(text="<p>New pricing</p>"))
+    entry = {"content_hash": content_hash("<p>Old pricing</p>")}
+
+    assert revalidate("https://tool.io", entry)[0]
+
+
+def test_markup_only_change_is_unchanged(fake_get):
+    fake_get(FakeResponse(text="<div><script>n=2</script><p>Pricing</p></div>"))
+    entry = {"content_hash": content_hash("<p>Pricing</p><script>n=1</script>")}
+
+    assert not revalidate("https://tool.io", entry)[0]
+
+
+def test_budget_spends_and_refills(monkeypatch):
+    now = 1_000_000.0
+    monkeypatch.setattr(warmer.time, "time", lambda: now)
+    budget = LLMBudget(calls_per_hour=8)
+
+    assert budget.try_spend(4)
+    assert budget.try_spend(4)
+    assert not budget.try_spend(4)
+
+    now += 1800  # half an hour refills 4 calls
+    assert budget.try_spend(4)
+    assert not budget.try_spend(1)
+
+
+def test_budget_state_survives_a_new_instance(tmp_path):
+    path = tmp_path / "llm_budget.json"
+    first = LLMBudget(calls_per_hour=8)
+    first.attach(path)
+    assert first.try_spend(8)
+
+    second = LLMBudget(calls_per_hour=8)
+    second.attach(path)
+    assert not second.try_spend(4)
+
+
+def _warmer(tmp_path, budget, urls):
+    store = ReviewStore(str(tmp_path))
+    tracker = PopularityTracker(str(tmp_path))
+    for url in urls:
+        tracker.record(url)
+    return store, CacheWarmer(store, tracker, budget=budget)
+
+
+def test_run_once_regenerates_changed_pages_within_budget(tmp_path, fake_get, monkeypatch):
+    urls = ["https://a.io", "https://b.io"]
+    store, cache_warmer = _warmer(tmp_path, LLMBudget(calls_per_hour=4), urls)
+    for url in urls:
+        store.put(url, {"url": url, "final_review": "old"}, content_hash="stale")
+    fake_get(FakeResponse(text="<p>changed</p>"))
+    reviewed = []
+    monkeypatch.setattr(
+        warmer, "review_url", lambda url: reviewed.append(url) or {"url": url, "final_review": "new"}
+    )
+
+    counts = cache_warmer.run_once()
+
+    assert counts == {"checked": 2, "regenerated": 1, "skipped_budget": 1, "errors": 0}
+    assert len(reviewed) == 1
+    assert store.get(reviewed[0])["review"]["final_review"] == "new"
+    skipped = next(url for url in urls if url not in reviewed)
+    assert store.get(skipped)["review"]["final_review"] == "old"
+
+
+def test_run_once_marks_unchanged_pages_checked(tmp_path, fake_get, monkeypatch):
+    store, cache_warmer = _warmer(tmp_path, LLMBudget(calls_per_hour=4), ["https://a.io"])
+    store.put("https://a.io", {"url": "https://a.io"}, etag='"v1"')
+    before = store.get("https://a.io")["checked_at"]
+    fake_get(FakeResponse(status_code=304))
+    monkeypatch.setattr(warmer, "review_url", lambda url: pytest.fail("regenerated"))
+    time.sleep(0.01)
+
+    assert cache_warmer.run_once()["checked"] == 1
+    assert store.get("https://a.io")["checked_at"] > before
@@ -0,0 +1,225 @@
+"""
+Background cache warmer for popular tool reviews.
+
+Runs inside the API process (REVIEW_WARMER=inprocess, the default) or as a
+separate worker with `python warmer.py` (set REVIEW_WARMER=off for the API).
+With several API workers, each one flushes its popularity counts, but only
+the process holding warmer.lock in the cache directory runs warming passes,
+so the LLM budget applies once per deployment rather than once per worker.
+"""
+from bs4 import BeautifulSoup
+from pathlib import Path
+from dotenv import load_dotenv
+from typing import Optional, Tuple
+import fcntl
+import hashlib
+import json
+import os
+import threading
+import time
+import requests
+
+from agents.agents import review_url
+from review_cache import (
+    POPULARITY_FLUSH_INTERVAL,
+    PopularityTracker,
+    ReviewStore,
+    write_json_atomic,
+)
+
+# Load environment variables
+load_dotenv()
+
+# Warmer settings (override in .env)
+WARMER_MODE = os.getenv("REVIEW_WARMER", "inprocess")  # "inprocess" or "off"
+WARM_INTERVAL = int(os.getenv("REVIEW_WARM_INTERVAL", "900"))  # seconds between passes
+WARM_TOP_N = int(os.getenv("REVIEW_WARM_TOP_N", "20"))  # URLs kept warm
+# LLM calls the warmer may spend per hour on regenerating reviews
+LLM_BUDGET_PER_HOUR = int(os.getenv("REVIEW_WARM_LLM_BUDGET", "80"))
+# review_url makes one call each for category, features, details and final review
+LLM_CALLS_PER_REVIEW = 4
+REQUEST_TIMEOUT = 15
+
+
+class LLMBudget:
+    """
+    Token bucket refilled continuously at calls_per_hour.
+
+    Once attached to a file, the bucket survives restarts and warmer.lock
+    handovers between API workers instead of starting full each time.
+    """
+
+    def __init__(self, calls_per_hour: int = LLM_BUDGET_PER_HOUR):
+        self.capacity = calls_per_hour
+        self.tokens = float(calls_per_hour)
+        self.updated = time.time()
+        self.path = None
+
+    def attach(self, path: Path):
+        """Load persisted state from `path` and save every spend back to it"""
+        self.path = Path(path)
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                state = json.load(f)
+            self.tokens = float(state["tokens"])
+            self.updated = float(state["updated"])
+        except (FileNotFoundError, ValueError, KeyError, TypeError):
+            pass
+
+    def try_spend(self, calls: int) -> bool:
+        now = time.time()
+        self.tokens = min(
+            self.capacity,
+            self.tokens + max(now - self.updated, 0) * self.capacity / 3600,
+        )
+        self.updated = now
+        if self.tokens < calls:
+            return False
+        self.tokens -= calls
+        if self.path is not None:
+            write_json_atomic(self.path, {"tokens": self.tokens, "updated": self.updated})
+        return True
+
+
+def content_hash(html: str) -> str:
+    """Hash the visible page text so script nonces and markup churn don't count"""
+    text = " ".join(BeautifulSoup(html, "html.parser").get_text().split())
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def revalidate(url: str, entry: Optional[dict]) -> Tuple[bool, dict]:
+    """
+    Conditional GET against the cached validators.
+
+    Returns:
+        (changed, validators) where validators holds etag, last_modified
+        and content_hash for the current version of the page
+    """
+    headers = {}
+    if entry and entry.get("etag"):
+        headers["If-None-Match"] = entry["etag"]
+    if entry and entry.get("last_modified"):
+        headers["If-Modified-Since"] = entry["last_modified"]
+
+    response = requests.get(url, headers=headers, timeout=REQUEST_TIMEOUT)
+    if response.status_code == 304:
+        return False, {}
+    response.raise_for_status()
+
+    validators = {
+        "etag": response.headers.get("ETag"),
+        "last_modified": response.headers.get("Last-Modified"),
+        "content_hash": content_hash(response.text),
+    }
+    # Reviews cached from the request path have no hash yet; adopt the
+    # current page as their baseline instead of regenerating them
+    previous = entry.get("content_hash") if entry else None
+    changed = entry is None or (
+        previous is not None and previous != validators["content_hash"]
+    )
+    return changed, validators
+
+
+class CacheWarmer:
+    """Periodically revalidates popular URLs and regenerates changed reviews"""
+
+    def __init__(
+        self,
+        store: ReviewStore,
+        tracker: PopularityTracker,
+        interval: int = WARM_INTERVAL,
+        top_n: int = WARM_TOP_N,
+        budget: Optional[LLMBudget] = None,
+        warm: bool = True,
+    ):
+        self.store = store
+        self.tracker = tracker
+        self.interval = interval
+        self.top_n = top_n
+        self.budget = budget or LLMBudget()
+        # False: only flush this process's popularity counts
+        self.warm = warm
+        self._lock_file = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _acquire_lock(self) -> bool:
+        """Hold warmer.lock for the life of the process; one warmer per cache dir"""
+        if self._lock_file is not None:
+            return True
+        lock_file = open(Path(self.store.dir) / "warmer.lock", "w")
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            return False
+        self._lock_file = lock_file
+        # Pick up what earlier holders of the lock already spent
+        self.budget.attach(Path(self.store.dir) / "llm_budget.json")
+        return True
+
+    def _release_lock(self):
+        if self._lock_file is not None:
+            fcntl.flock(self._lock_file, fcntl.LOCK_UN)
+            self._lock_file.close()
+            self._lock_file = None
+
+    def run_once(self) -> dict:
+        """One warming pass over the most popular URLs"""
+        counts = {"checked": 0, "regenerated": 0, "skipped_budget": 0, "errors": 0}
+        for url in self.tracker.top_urls(self.top_n):
+            if self._stop.is_set():
+                break
+            entry = self.store.get(url)
+            try:
+                changed, validators = revalidate(url, entry)
+                counts["checked"] += 1
+                if not changed:
+                    self.store.mark_checked(url, **validators)
+                    continue
+                if not self.budget.try_spend(LLM_CALLS_PER_REVIEW):
+                    counts["skipped_budget"] += 1
+                    continue
+                self.store.put(url, review_url(url), **validators)
+                counts["regenerated"] += 1
+            except Exception as e:
+                counts["errors"] += 1
+                print(f"⚠️ Warming {url} failed: {e}")
+        return counts
+
+    def _loop(self):
+        next_pass = 0.0
+        while not self._stop.is_set():
+            self.tracker.save()
+            if self.warm and time.monotonic() >= next_pass and self._acquire_lock():
+                counts = self.run_once()
+                print(f"🔥 Cache warm pass: {counts}")
+                next_pass = time.monotonic() + self.interval
+            self._stop.wait(min(self.interval, POPULARITY_FLUSH_INTERVAL))
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._loop, daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=REQUEST_TIMEOUT)
+        self.tracker.save()
+        self._release_lock()
+
+
+def main():
+    print("\n🔥 Starting review cache warmer...\n")
+    warmer = CacheWarmer(ReviewStore(), PopularityTracker())
+    try:
+        warmer._loop()
+    except KeyboardInterrupt:
+        warmer.stop()
+        print("\n👋 Cache warmer stopped")
+
+
+if __name__ == "__main__":
+    main()